@@ -1,10 +1,12 @@
-from src.generators.customers import generate_customers
 from src.config_loader import load_config
 from src.generators.customers import generate_customers
 from src.validation.validator import validate_customer_df
 from pathlib import Path
 from src.generators.transactions import generate_transactions
-from src.validation.validator import validate_transaction_df
+from src.validation.validator import validate_transaction_df, validate_referential_integrity
+from src.validation.conformance import ConformanceChecker
+from src.writers.csv_writer import write_csv
+from src.timestamps import materialize_timestamps, epoch_seconds_to_datetime
 
 def main():
     print("Starting process...\n____________________________")
@@ -14,62 +16,87 @@ def main():
     if cfg["datasets"]["customers"]["enabled"]:
         print("Generating customers dataset...")
         customers_df = generate_customers(cfg)
+        # customers_df keeps int64 epoch seconds for the transactions generator, datetimes are only built for output
+        customers_output_cfg = cfg["datasets"]["customers"]["output"]
+        customers_out_df = materialize_timestamps(customers_df, ["signup_date"],
+                                                  customers_output_cfg.get("timestamp_unit", "ns"))
 
         print("Validating customers dataset...")
-        if validate_customer_df(customers_df):
+        if validate_customer_df(customers_out_df):
             print("Customers dataset is valid.")
         else:
             print("Customers dataset is invalid.")
             print("Process terminated due to validation failure.")
             return
         
-        output_path = cfg["datasets"]["customers"]["output"]["path"] # get path from config
-        # create parent directories if they don't exist
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        if cfg["datasets"]["customers"]["output"]["format"] == "csv":
-            print("Saving customers dataset to CSV...")
-            customers_df.to_csv(output_path, index=False)
-            print(f"Customers dataset saved to {output_path} in CSV format.")
-        elif cfg["datasets"]["customers"]["output"]["format"] == "parquet":
-            print("Saving customers dataset to Parquet...")
-            customers_df.to_parquet(output_path, index=False)
-            print(f"Customers dataset saved to {output_path} in Parquet format.")
-        else:
-            print("Unsupported output format specified in configuration.")
+        save_dataset(customers_out_df, customers_output_cfg, "customers")
 
     if cfg["datasets"]["transactions"]["enabled"]:
         print("Generating transactions dataset...")
 
 
-        transactions_df = generate_transactions(cfg, customers_df)
+        conformance = create_conformance_checker(cfg)
+        transactions_df = generate_transactions(cfg, customers_df, conformance)
 
-        print("Validating transactions dataset...")
-        if validate_transaction_df(transactions_df):
-            print("Transactions dataset is valid.")
-        else:
-            print("Transactions dataset is invalid.")
-            print("Process terminated due to validation failure.")
+        if not finish_transactions(cfg, transactions_df, customers_df, conformance):
+            print("Process terminated due to validation or conformance failure.")
             return
-        
-        output_path = cfg["datasets"]["transactions"]["output"]["path"] # get path from config
-        # create parent directories if they don't exist
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        if cfg["datasets"]["transactions"]["output"]["format"] == "csv":
-            print("Saving transactions dataset to CSV...")
-            transactions_df.to_csv(output_path, index=False)
-            print(f"Transactions dataset saved to {output_path} in CSV format.")
-        elif cfg["datasets"]["transactions"]["output"]["format"] == "parquet":
-            print("Saving transactions dataset to Parquet...")
-            transactions_df.to_parquet(output_path, index=False)
-            print(f"Transactions dataset saved to {output_path} in Parquet format.")
+
+
+def create_conformance_checker(cfg: dict):
+    """Return a ConformanceChecker for the transactions config, or None if conformance checks are disabled."""
+    if cfg["datasets"]["transactions"].get("conformance", {}).get("enabled", False):
+        return ConformanceChecker(cfg["datasets"]["transactions"])
+    return None
+
+def finish_transactions(cfg: dict, transactions_df, customers_df, conformance=None) -> bool:
+    """Convert timestamps for output, validate, check conformance and save a generated transactions dataset.
+    customers_df is only used for the referential integrity check.
+    Returns False (and saves nothing) if validation or conformance fails."""
+    output_cfg = cfg["datasets"]["transactions"]["output"]
+    # Epoch seconds are no longer needed, convert in place instead of copying the whole frame
+    transactions_df["transaction_timestamp"] = epoch_seconds_to_datetime(
+        transactions_df["transaction_timestamp"].to_numpy(), output_cfg.get("timestamp_unit", "ns"))
+
+    print("Validating transactions dataset...")
+    if validate_transaction_df(transactions_df) and validate_referential_integrity(transactions_df, customers_df):
+        print("Transactions dataset is valid.")
+    else:
+        print("Transactions dataset is invalid.")
+        return False
+
+    if conformance is not None:
+        print("Checking transactions conformance with configuration...")
+        significance_level = cfg["datasets"]["transactions"]["conformance"].get("significance_level", 0.001)
+        if conformance.report(significance_level):
+            print("Transactions dataset conforms to configuration.")
         else:
-            print("Unsupported output format specified in configuration.")
+            print("Transactions dataset does not conform to configuration.")
+            return False
 
-        
+    save_dataset(transactions_df, output_cfg, "transactions")
+    return True
+
+def save_dataset(df, output_cfg: dict, dataset_name: str) -> None:
+    """Save a dataset to the path and format defined in its output configuration."""
+    output_path = output_cfg["path"] # get path from config
+    # create parent directories if they don't exist
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    if output_cfg["format"] == "csv":
+        print(f"Saving {dataset_name} dataset to CSV...")
+        write_csv(df, output_path,
+                  compression=output_cfg.get("compression", "none"),
+                  chunk_rows=output_cfg.get("chunk_rows", 500_000),
+                  threads=output_cfg.get("threads"))
+        print(f"{dataset_name.capitalize()} dataset saved to {output_path} in CSV format.")
+    elif output_cfg["format"] == "parquet":
+        print(f"Saving {dataset_name} dataset to Parquet...")
+        df.to_parquet(output_path, index=False)
+        print(f"{dataset_name.capitalize()} dataset saved to {output_path} in Parquet format.")
+    else:
+        print("Unsupported output format specified in configuration.")
 
-        
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -7,6 +7,7 @@ import uuid
 from faker import Faker
 fake = Faker("es_ES")
 import numpy as np
+from src.timestamps import to_epoch_seconds
 
 def generate_customers(cfg: dict) -> pd.DataFrame:
     """Generate synthetic customer data based on configuration parameters."""
@@ -73,12 +74,12 @@ def generate_customer_incomes(n:int, mean: float, stddev: float) -> list:
     # print(incomes_list) #test
     return incomes_list
 
-def generate_customer_signup_dates(n:int, start_date: str, end_date: str) -> list:
-    """Generate a list of customer random signup dates between start_date and end_date"""
-    start_u = pd.to_datetime(start_date).value // 10**9 # Convert to unix timestamp in seconds
-    end_u = pd.to_datetime(end_date).value // 10**9 # Convert to unix timestamp in seconds
-    random_unix_dates = np.random.randint(start_u, end_u, n)
-    signup_dates = pd.to_datetime(random_unix_dates, unit='s').tolist() # Convert back to datetime format and list everything
+def generate_customer_signup_dates(n:int, start_date: str, end_date: str) -> np.ndarray:
+    """Generate an array of customer random signup dates between start_date and end_date"""
+    """Dates are kept as int64 unix seconds, they are converted to datetime only when the dataset is saved"""
+    start_u = to_epoch_seconds(start_date)
+    end_u = to_epoch_seconds(end_date)
+    signup_dates = np.random.randint(start_u, end_u, n, dtype=np.int64)
     # print(signup_dates) #test
     return signup_dates
 
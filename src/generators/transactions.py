@@ -4,19 +4,24 @@
 import pandas as pd
 import numpy as np
 import uuid
+from src.timestamps import to_epoch_seconds, epoch_seconds_to_months
 
-def generate_transactions(cfg: dict, customers_df: pd.DataFrame) -> pd.DataFrame:
-    """Generate synthetic transactions data based on configuration parameters and existing customers."""
+def generate_transactions(cfg: dict, customers_df: pd.DataFrame, conformance=None) -> pd.DataFrame:
+    """Generate synthetic transactions data based on configuration parameters and existing customers.
+    If a ConformanceChecker is given, it is fed with the generated data before helper columns are dropped.
+    Times (customers signup_date and the generated transaction_timestamp) are int64 unix seconds."""
 
     # Load transactions configuration
     transactions_cfg = cfg["datasets"]["transactions"]
     customers_df = assign_income_tier(customers_df, cfg["datasets"]["transactions"]["income_tiers"])
-    customers_df = compute_active_period(customers_df, 
-                                        pd.Timestamp(cfg["datasets"]["transactions"]["date_range"]["start"]),
-                                        pd.Timestamp(cfg["datasets"]["transactions"]["date_range"]["end"]))
+    global_start = to_epoch_seconds(cfg["datasets"]["transactions"]["date_range"]["start"])
+    global_end = to_epoch_seconds(cfg["datasets"]["transactions"]["date_range"]["end"])
+    customers_df = compute_active_period(customers_df, global_start, global_end)
     customers_df = generate_num_transactions_per_customer(customers_df, transactions_cfg)
+    if conformance is not None:
+        conformance.update_activity(customers_df)
     transactions_df = expand_customers_to_transactions(customers_df)
-    transactions_df = generate_transaction_dates(transactions_df)
+    transactions_df = generate_transaction_dates(transactions_df, global_end)
     transactions_df = generate_transactions_amounts(transactions_df, transactions_cfg)
     transactions_df = generate_merchant_categories(transactions_df, 
                                                    transactions_cfg["categories"]["merchant_categories"],
@@ -32,6 +37,8 @@ def generate_transactions(cfg: dict, customers_df: pd.DataFrame) -> pd.DataFrame
     transactions_df = generate_transaction_country(transactions_df,
                           transactions_cfg["business_rules"]["transaction_country"])
     transactions_df = derive_is_international(transactions_df)
+    if conformance is not None:
+        conformance.update_transactions(transactions_df)
 
     transactions_df = df_cleanup(transactions_df)
     # print("___________________________")
@@ -57,30 +64,20 @@ def assign_income_tier(customers_df: pd.DataFrame, income_tiers_cfg: dict) -> pd
     return customers_df
 
 
-def compute_active_period(customers_df: pd.DataFrame, global_start: pd.Timestamp, global_end: pd.Timestamp) -> pd.DataFrame:
-    """Compute active_start, active_end, and active_months for each customer."""
+def compute_active_period(customers_df: pd.DataFrame, global_start: int, global_end: int) -> pd.DataFrame:
+    """Compute active_start and active_months for each customer."""
+    """All times are int64 unix seconds. The active period always ends at global_end,
+    so it is passed around as a scalar instead of being stored on every customer."""
 
-    active_starts = []
-    active_ends = []
-    active_months_list = []
+    active_starts = np.maximum(customers_df["signup_date"].to_numpy(dtype="int64"), global_start)
 
-    for signup_date in customers_df["signup_date"]:
-        active_start = max(signup_date, global_start)
-        active_end = global_end
-
-        # Months active
-        months_active = (active_end.year - active_start.year) * 12 + (active_end.month - active_start.month)
-        months_active = max(months_active, 0)
-
-        # Append
-        active_starts.append(active_start)
-        active_ends.append(active_end)
-        active_months_list.append(months_active)
+    # Months active (calendar months between active_start and global_end)
+    months_active = epoch_seconds_to_months(global_end) - epoch_seconds_to_months(active_starts)
+    months_active = np.maximum(months_active, 0)
 
     # Add columns
     customers_df["active_start"] = active_starts
-    customers_df["active_end"] = active_ends
-    customers_df["active_months"] = active_months_list
+    customers_df["active_months"] = months_active
 
     return customers_df
 
@@ -114,23 +111,21 @@ def expand_customers_to_transactions(customers_df: pd.DataFrame) -> pd.DataFrame
     transactions_df.reset_index(drop=True, inplace=True)
     return transactions_df
 
-def generate_transaction_dates(transactions_df: pd.DataFrame) -> pd.DataFrame:
-    """Generate a random timestamp (date + time) for each transaction between active_start and active_end."""
+def generate_transaction_dates(transactions_df: pd.DataFrame, global_end: int) -> pd.DataFrame:
+    """Generate a random timestamp (int64 unix seconds) for each transaction between active_start and global_end."""
     
-    # Convert datetime to int64 ns for fast operations
-    start_ns = transactions_df["active_start"].view("int64")
-    end_ns = transactions_df["active_end"].view("int64")
+    start_s = transactions_df["active_start"].to_numpy(dtype="int64")
     
-    # Range in ns
-    delta_ns = end_ns - start_ns
+    # Range in seconds
+    delta_s = global_end - start_s
 
     # Random fraction [0,1) per row
     rand = np.random.rand(len(transactions_df))
 
     # Compute final timestamps
-    random_ns = start_ns + (delta_ns * rand).astype("int64")
+    random_s = start_s + (delta_s * rand).astype("int64")
 
-    transactions_df["transaction_timestamp"] = pd.to_datetime(random_ns)
+    transactions_df["transaction_timestamp"] = random_s
 
     return transactions_df
 
@@ -279,7 +274,7 @@ def df_cleanup(transactions_df: pd.DataFrame) -> pd.DataFrame:
     """Remove helper columns used during generation."""
     """Make sure to keep only relevant transaction columns."""
     """Maintain consistency with the expected schema, if columns or columns names are modified, update schema accordingly."""
-    columns_to_drop = ["income_tier", "active_start", "active_end", "active_months", "num_transactions", "customer_name",
+    columns_to_drop = ["income_tier", "active_start", "active_months", "num_transactions", "customer_name",
                        "age", "income", "signup_date", "region"]
     transactions_df = transactions_df.drop(columns=columns_to_drop)
     return transactions_df
@@ -0,0 +1,189 @@
+# Scenario sweep runner
+# Generates the customers dataset once and runs several transaction variants on top of it in parallel.
+# Each variant is the base config plus a set of overrides (e.g. different status_distribution or customer_activity).
+
+import argparse
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.cli import create_conformance_checker, finish_transactions, save_dataset
+from src.config_loader import load_config
+from src.generators.customers import generate_customers
+from src.generators.transactions import generate_transactions
+from src.timestamps import materialize_timestamps
+from src.validation.validator import validate_customer_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run transaction scenario variants over a shared customer base.")
+    parser.add_argument("sweep", nargs="?", default="sweep.yaml", help="Path to the sweep definition YAML file.")
+    args = parser.parse_args()
+
+    print("Starting sweep...\n____________________________")
+    run_sweep(load_sweep(args.sweep))
+
+
+def load_sweep(path: str) -> dict:
+    """Load the sweep definition (base config, seeds, processes and variants) from a YAML file."""
+    with open(path, 'r') as file:
+        sweep_cfg = yaml.safe_load(file)
+
+    names = [variant["name"] for variant in sweep_cfg["variants"]]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Variant names must be unique, got {names}")
+    return sweep_cfg
+
+
+def run_sweep(sweep_cfg: dict) -> dict:
+    """Generate customers once, share them with a process pool and generate every transaction variant.
+    Returns a dict mapping each variant name to its output path (None if the variant failed validation or conformance)."""
+    base_cfg = load_config(sweep_cfg.get("base_config", "config.yaml"))
+
+    # Resolve every variant first, so a bad override fails before anything is generated
+    tasks = []
+    for i, variant in enumerate(sweep_cfg["variants"]):
+        variant_cfg = apply_overrides(base_cfg, variant.get("overrides", {}))
+        if "datasets.transactions.output.path" not in variant.get("overrides", {}):
+            variant_cfg["datasets"]["transactions"]["output"]["path"] = variant_output_path(
+                base_cfg["datasets"]["transactions"]["output"]["path"], variant["name"])
+        seed = variant.get("seed", sweep_cfg.get("base_seed", 0) + i)
+        tasks.append((variant["name"], variant_cfg, seed))
+
+    # Customers are generated and validated once for every variant
+    print("Generating customers dataset...")
+    np.random.seed(sweep_cfg.get("customers_seed"))
+    customers_df = generate_customers(base_cfg)
+    # customers_df keeps int64 epoch seconds (shared with the workers), datetimes are only built for output
+    customers_output_cfg = base_cfg["datasets"]["customers"]["output"]
+    customers_out_df = materialize_timestamps(customers_df, ["signup_date"],
+                                              customers_output_cfg.get("timestamp_unit", "ns"))
+
+    print("Validating customers dataset...")
+    if not validate_customer_df(customers_out_df):
+        print("Customers dataset is invalid.")
+        print("Sweep terminated due to validation failure.")
+        return {}
+    save_dataset(customers_out_df, customers_output_cfg, "customers")
+
+    shared_blocks, layout = share_dataframe(customers_df)
+    results = {}
+    try:
+        with ProcessPoolExecutor(max_workers=sweep_cfg.get("processes")) as pool:
+            futures = [pool.submit(run_variant, layout, name, variant_cfg, seed) for name, variant_cfg, seed in tasks]
+            for future in futures:
+                name, output_path = future.result()
+                results[name] = output_path
+    finally:
+        for shm in shared_blocks:
+            shm.close()
+            shm.unlink()
+
+    print("____________________________")
+    for name, output_path in results.items():
+        status = f"saved to {output_path}" if output_path else "failed validation, not saved"
+        print(f"Variant '{name}': {status}")
+    return results
+
+
+def run_variant(layout: list, name: str, cfg: dict, seed: int) -> tuple:
+    """Attach to the shared customers and run one variant (runs inside a worker process)."""
+    customers_df, handles = attach_dataframe(layout)
+    try:
+        return generate_variant(customers_df, name, cfg, seed)
+    finally:
+        del customers_df  # drop the views on the shared blocks before closing them
+        for shm in handles:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # still referenced (e.g. by an exception traceback), released when the worker exits
+
+
+def generate_variant(customers_df: pd.DataFrame, name: str, cfg: dict, seed: int) -> tuple:
+    """Generate, validate and save the transactions of a single variant."""
+    np.random.seed(seed)
+
+    conformance = create_conformance_checker(cfg)
+
+    print(f"[{name}] Generating transactions dataset (seed={seed})...")
+    transactions_df = generate_transactions(cfg, customers_df, conformance)
+
+    if not finish_transactions(cfg, transactions_df, customers_df, conformance):
+        print(f"[{name}] Variant failed validation or conformance, not saved.")
+        return name, None
+    return name, cfg["datasets"]["transactions"]["output"]["path"]
+
+
+def apply_overrides(cfg: dict, overrides: dict) -> dict:
+    """Return a copy of cfg with dotted-path overrides applied,
+    e.g. {'datasets.transactions.status_distribution.weights': [0.8, 0.1, 0.05, 0.05]}.
+    Only keys that already exist under datasets.transactions can be overridden: customers are
+    generated once from the base config and cannot vary per variant."""
+    cfg = copy.deepcopy(cfg)
+    for dotted_key, value in overrides.items():
+        if not dotted_key.startswith("datasets.transactions."):
+            raise ValueError(
+                f"Override '{dotted_key}' is outside datasets.transactions; "
+                f"customers are shared by every variant and cannot be overridden"
+            )
+        node = cfg
+        *parents, leaf = dotted_key.split(".")
+        for key in parents + [leaf]:
+            if not isinstance(node, dict) or key not in node:
+                raise KeyError(f"Override '{dotted_key}' does not match the configuration ('{key}' not found)")
+            parent, node = node, node[key]
+        parent[leaf] = value
+    return cfg
+
+
+def variant_output_path(base_path: str, name: str) -> str:
+    """Build a per-variant output path by suffixing the base file name with the variant name."""
+    path = Path(base_path)
+    return str(path.with_name(f"{path.stem}_{name}{path.suffix}"))
+
+
+def share_dataframe(df: pd.DataFrame) -> tuple:
+    """Copy each column of df into its own shared memory block.
+    Returns the blocks (owned by the caller, who must close and unlink them) and a
+    picklable layout that worker processes use to attach to them."""
+    blocks = []
+    layout = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            if pd.isna(values).any():
+                raise ValueError(f"Column '{col}' has null values, which cannot be stored in shared memory")
+            values = values.astype(str)  # fixed-width unicode so it can live in a flat buffer
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+        shared[:] = values
+        blocks.append(shm)
+        layout.append((col, shm.name, values.dtype.str, values.shape))
+    return blocks, layout
+
+
+def attach_dataframe(layout: list) -> tuple:
+    """Rebuild a DataFrame on top of the shared memory blocks described by layout.
+
+    Numeric and datetime columns are read-only views of the shared blocks (no copy), the generators
+    only add new columns next to them. pandas has no fixed-width string dtype, so string columns are
+    still converted to per-row Python objects in every worker.
+    Returns the DataFrame and the SharedMemory handles, which must stay open while the DataFrame is in use."""
+    data = {}
+    handles = []
+    for col, shm_name, dtype, shape in layout:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        handles.append(shm)
+        values = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        values.flags.writeable = False
+        data[col] = values.astype(object) if values.dtype.kind == "U" else values
+    return pd.DataFrame(data, copy=False), handles
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Timestamp engine
+# Inside the pipeline every time value is stored as int64 seconds since the unix epoch (1970-01-01),
+# which avoids lists of Timestamp objects and keeps time columns as plain numeric arrays.
+# Datetime columns are only materialized at the output boundary (validation and saving).
+
+import numpy as np
+import pandas as pd
+
+TIMESTAMP_UNITS = ("s", "ms", "us", "ns")
+
+
+def to_epoch_seconds(date) -> int:
+    """Convert a date string or Timestamp to int64 seconds since the unix epoch."""
+    return pd.Timestamp(date).value // 10**9
+
+def epoch_seconds_to_months(seconds: np.ndarray) -> np.ndarray:
+    """Convert epoch seconds to the number of calendar months since 1970-01 (e.g. 2020-03-15 -> 602)."""
+    return np.asarray(seconds, dtype="int64").astype("datetime64[s]").astype("datetime64[M]").astype("int64")
+
+def epoch_seconds_to_datetime(seconds: np.ndarray, unit: str = "ns") -> np.ndarray:
+    """Convert epoch seconds to a datetime64 array with the given unit ('s', 'ms', 'us' or 'ns')."""
+    if unit not in TIMESTAMP_UNITS:
+        raise ValueError(f"Unsupported timestamp unit '{unit}', expected one of {TIMESTAMP_UNITS}")
+    return np.asarray(seconds, dtype="int64").astype("datetime64[s]").astype(f"datetime64[{unit}]")
+
+def materialize_timestamps(df: pd.DataFrame, columns: list, unit: str = "ns") -> pd.DataFrame:
+    """Return a shallow copy of df where the given epoch seconds columns are converted to datetime columns.
+    The input DataFrame is left untouched so it can keep flowing through the pipeline (e.g. customers,
+    which the transactions generator needs in epoch seconds); untouched columns are not copied.
+    When the epoch seconds are no longer needed, replace the column in place instead."""
+    out = df.copy(deep=False)
+    for col in columns:
+        out[col] = epoch_seconds_to_datetime(df[col].to_numpy(), unit)
+    return out
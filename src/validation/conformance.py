@@ -0,0 +1,298 @@
+"""Statistical conformance of the generated transactions against config.yaml.
+The checker is fed by generate_transactions while it runs (before helper columns are dropped)
+and only keeps one-pass streaming aggregates: counts, running moments and a fixed-bin histogram.
+The output files are never re-read."""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Rows aggregated per step, keeps temporaries bounded on very large datasets
+CONFORMANCE_CHUNK_ROWS = 1_000_000
+
+# Fixed histogram sketch for the standardized log-amounts
+Z_EDGES = np.linspace(-6.0, 6.0, 481)
+
+
+class ConformanceChecker:
+    """Accumulate streaming aggregates of the generated data and test them against the configured distributions.
+
+    Rules:
+      - merchant_category: category counts vs categories.weights (chi-square)
+      - transaction_status: status counts vs status_distribution.weights (chi-square)
+      - channel: channel counts per merchant category vs business_rules.channels (chi-square)
+      - domestic_probability: domestic counts per region vs domestic_probability_by_region (chi-square)
+      - transaction_amount: standardized log-amounts vs N(0, 1) (KS on the histogram, clipped tails excluded)
+      - activity_rate: transactions per income tier vs the Poisson means (chi-square)
+      - activity_dispersion: per-customer Poisson dispersion index (chi-square)
+    """
+
+    def __init__(self, transactions_cfg: dict, chunk_rows: int = CONFORMANCE_CHUNK_ROWS):
+        self.cfg = transactions_cfg
+        self.chunk_rows = chunk_rows
+
+        self.category_counts = {}
+        self.status_counts = {}
+        self.channel_counts = {}  # (merchant_category, channel) -> count
+        self.domestic_counts = {}  # (region, is_domestic) -> count
+
+        self.z_histogram = np.zeros(len(Z_EDGES) + 1, dtype=np.int64)  # plus underflow / overflow bins
+        self.z_moments = RunningMoments()
+        self.z_lower_bound = -np.inf  # highest per-row lower clipping bound seen
+        self.z_upper_bound = np.inf  # lowest per-row upper clipping bound seen
+
+        self.activity_observed = {}  # income tier -> total transactions
+        self.activity_expected = {}  # income tier -> total Poisson mean
+        self.dispersion_stat = 0.0
+        self.dispersion_dof = 0
+
+    def update_activity(self, customers_df: pd.DataFrame) -> None:
+        """Aggregate the number of transactions drawn per customer (needs income_tier, active_months, num_transactions)."""
+        activity_cfg = self.cfg["customer_activity"]
+        rates = {
+            "low": activity_cfg["low_income_mean_tx_per_month"],
+            "mid": activity_cfg["mid_income_mean_tx_per_month"],
+            "high": activity_cfg["high_income_mean_tx_per_month"],
+        }
+        for chunk in iter_chunks(customers_df, self.chunk_rows):
+            tiers = chunk["income_tier"].to_numpy()
+            lam = chunk["income_tier"].map(rates).to_numpy(dtype=float) * chunk["active_months"].to_numpy(dtype=float)
+            observed = chunk["num_transactions"].to_numpy(dtype=float)
+
+            for tier in rates:
+                mask = tiers == tier
+                self.activity_observed[tier] = self.activity_observed.get(tier, 0.0) + observed[mask].sum()
+                self.activity_expected[tier] = self.activity_expected.get(tier, 0.0) + lam[mask].sum()
+
+            positive = lam > 0
+            self.dispersion_stat += float((((observed - lam) ** 2)[positive] / lam[positive]).sum())
+            self.dispersion_dof += int(positive.sum())
+
+    def update_transactions(self, transactions_df: pd.DataFrame) -> None:
+        """Aggregate a block of generated transactions (needs the customer helper columns income, income_tier and region)."""
+        for chunk in iter_chunks(transactions_df, self.chunk_rows):
+            add_counts(self.category_counts, chunk["merchant_category"].value_counts())
+            add_counts(self.status_counts, chunk["transaction_status"].value_counts())
+            add_counts(self.channel_counts, chunk.groupby(["merchant_category", "channel"]).size())
+
+            is_domestic = chunk["transaction_country"] == chunk["region"]
+            add_counts(self.domestic_counts, is_domestic.groupby(chunk["region"]).value_counts())
+
+            self._update_amounts(chunk)
+
+    def _update_amounts(self, chunk: pd.DataFrame) -> None:
+        """Standardize log-amounts with the per-row log-normal parameters and add them to the histogram sketch."""
+        amount_cfg = self.cfg["amount"]
+        sigma = amount_cfg["base_log_normal_sigma"]
+        factors = {
+            "low": amount_cfg["low_income_factor"],
+            "mid": amount_cfg["mid_income_factor"],
+            "high": amount_cfg["high_income_factor"],
+        }
+        base_spend = chunk["income"].to_numpy(dtype=float) * chunk["income_tier"].map(factors).to_numpy(dtype=float) / 12
+        mu = np.log(base_spend) - (sigma**2) / 2
+
+        z = (np.log(chunk["transaction_amount"].to_numpy(dtype=float)) - mu) / sigma
+        self.z_histogram += np.bincount(np.searchsorted(Z_EDGES, z, side="right"), minlength=len(Z_EDGES) + 1)
+        self.z_moments.update(z)
+
+        # Amounts are clipped to [1, 5 * base_spend]; the normal CDF only holds strictly between the bounds
+        if len(z):
+            self.z_lower_bound = max(self.z_lower_bound, float(((0.0 - mu) / sigma).max()))
+            self.z_upper_bound = min(self.z_upper_bound, float(((np.log(5 * base_spend) - mu) / sigma).min()))
+
+    def results(self) -> list:
+        """Compute the test statistic, degrees of freedom and p-value of every rule."""
+        results = []
+
+        categories_cfg = self.cfg["categories"]
+        results.append(chi_square_rule("merchant_category", self.category_counts,
+                                       categories_cfg["merchant_categories"], categories_cfg["weights"]))
+
+        status_cfg = self.cfg["status_distribution"]
+        results.append(chi_square_rule("transaction_status", self.status_counts,
+                                       status_cfg["values"], status_cfg["weights"]))
+
+        results.append(self._channel_result())
+        results.append(self._domestic_result())
+        results.append(self._amount_result())
+        results.append(self._activity_rate_result())
+
+        p_value = chi2_sf(self.dispersion_stat, self.dispersion_dof) if self.dispersion_dof else 1.0
+        results.append(rule_result("activity_dispersion", self.dispersion_stat, self.dispersion_dof, p_value,
+                                   f"index={self.dispersion_stat / max(self.dispersion_dof, 1):.4f}"))
+        return results
+
+    def report(self, significance_level: float) -> bool:
+        """Print every rule result and return False if any p-value is below significance_level."""
+        ok = True
+        for result in self.results():
+            passed = result["p_value"] >= significance_level
+            ok = ok and passed
+            print(
+                f"[CONFORMANCE] {'PASS' if passed else 'FAIL'} {result['rule']}: "
+                f"statistic={result['statistic']:.4f}, dof={result['dof']}, p={result['p_value']:.4g}"
+                + (f" ({result['details']})" if result["details"] else "")
+            )
+        return ok
+
+    def _channel_result(self) -> dict:
+        channels_cfg = self.cfg["business_rules"]["channels"]
+        stat, dof = 0.0, 0
+        for category in {category for category, _ in self.channel_counts}:
+            dist = channels_cfg["by_merchant_category"].get(category, channels_cfg["default_distribution"])
+            counts = {channel: n for (cat, channel), n in self.channel_counts.items() if cat == category}
+            category_stat, category_dof = chi_square(counts, dist["values"], dist["weights"])
+            stat += category_stat
+            dof += category_dof
+        return rule_result("channel", stat, dof, chi2_sf(stat, dof))
+
+    def _domestic_result(self) -> dict:
+        domestic_probs = self.cfg["business_rules"]["transaction_country"].get("domestic_probability_by_region", {})
+        stat, dof = 0.0, 0
+        for region in {region for region, _ in self.domestic_counts}:
+            p = domestic_probs.get(region, 1.0)
+            counts = {is_domestic: n for (r, is_domestic), n in self.domestic_counts.items() if r == region}
+            region_stat, region_dof = chi_square(counts, [True, False], [p, 1 - p])
+            stat += region_stat
+            dof += region_dof
+        return rule_result("domestic_probability", stat, dof, chi2_sf(stat, dof))
+
+    def _amount_result(self) -> dict:
+        n = int(self.z_histogram.sum())
+        details = f"z mean={self.z_moments.mean:.4f}, z std={self.z_moments.std:.4f}"
+        interior = (Z_EDGES > self.z_lower_bound) & (Z_EDGES < self.z_upper_bound)
+        if n == 0 or not interior.any():
+            return rule_result("transaction_amount", 0.0, 0, 1.0, details + ", no unclipped range to test")
+
+        # Empirical CDF at each edge: share of values strictly below it
+        empirical_cdf = np.cumsum(self.z_histogram)[:-1] / n
+        normal_cdf = np.array([0.5 * math.erfc(-edge / math.sqrt(2)) for edge in Z_EDGES])
+        d = float(np.abs(empirical_cdf - normal_cdf)[interior].max())
+        return rule_result("transaction_amount", d, 0, kolmogorov_sf(math.sqrt(n) * d), f"KS n={n}, " + details)
+
+    def _activity_rate_result(self) -> dict:
+        stat, dof = 0.0, 0
+        for tier, expected in self.activity_expected.items():
+            if expected > 0:
+                stat += (self.activity_observed[tier] - expected) ** 2 / expected
+                dof += 1
+        return rule_result("activity_rate", stat, dof, chi2_sf(stat, dof) if dof else 1.0)
+
+
+class RunningMoments:
+    """Streaming count, mean and variance (Welford / Chan parallel update)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        n_b = len(values)
+        if n_b == 0:
+            return
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta**2 * self.n * n_b / n
+        self.n = n
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int):
+    """Yield consecutive row blocks of df."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def add_counts(totals: dict, counts: pd.Series) -> None:
+    """Add a value_counts / groupby size Series into a running dict of counts."""
+    for key, n in counts.items():
+        totals[key] = totals.get(key, 0) + int(n)
+
+
+def chi_square(counts: dict, values: list, weights: list) -> tuple:
+    """Pearson chi-square statistic and degrees of freedom of observed counts vs expected weights.
+    Observing a value with zero (or no) expected weight makes the statistic infinite."""
+    n = sum(counts.values())
+    if n == 0:
+        return 0.0, 0
+    expected_probs = dict(zip(values, weights))
+    if any(n_obs > 0 and expected_probs.get(value, 0) <= 0 for value, n_obs in counts.items()):
+        return math.inf, max(len(values) - 1, 1)
+
+    stat = 0.0
+    dof = -1
+    for value, p in expected_probs.items():
+        if p > 0:
+            expected = n * p
+            stat += (counts.get(value, 0) - expected) ** 2 / expected
+            dof += 1
+    return stat, max(dof, 0)
+
+
+def chi_square_rule(rule: str, counts: dict, values: list, weights: list) -> dict:
+    stat, dof = chi_square(counts, values, weights)
+    return rule_result(rule, stat, dof, chi2_sf(stat, dof))
+
+
+def rule_result(rule: str, statistic: float, dof: int, p_value: float, details: str = "") -> dict:
+    return {"rule": rule, "statistic": statistic, "dof": dof, "p_value": p_value, "details": details}
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """Survival function of the chi-square distribution (regularized upper incomplete gamma Q(dof/2, x/2))."""
+    if dof <= 0:
+        return 0.0 if x > 0 else 1.0
+    if math.isinf(x):
+        return 0.0
+    a, x = dof / 2, x / 2
+    if x <= 0:
+        return 1.0
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        # Series expansion of the lower incomplete gamma
+        term = total = 1.0 / a
+        k = a
+        while abs(term) > abs(total) * 1e-15:
+            k += 1
+            term *= x / k
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+
+    # Continued fraction of the upper incomplete gamma (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefactor) * h)
+
+
+def kolmogorov_sf(lam: float) -> float:
+    """Asymptotic p-value of the Kolmogorov-Smirnov statistic sqrt(n) * D."""
+    if lam < 0.2:
+        return 1.0
+    total = sum((-1) ** (k - 1) * math.exp(-2 * k**2 * lam**2) for k in range(1, 101))
+    return min(1.0, max(0.0, 2 * total))
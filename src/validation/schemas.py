@@ -7,6 +7,9 @@ class CustomerSchema:
     # Columns that must be present in the dataset
     required_columns = ['customer_id', 'customer_name', 'age', 'income', 'signup_date', 'region']
 
+    # Column that must be unique and non-null
+    primary_key = 'customer_id'
+
     # Expected data types for each column
     # Note: These are semantic types; validator.py will map them to actual pandas dtypes.
     dtypes = {
@@ -54,6 +57,12 @@ class TransactionSchema:
         "is_international",
     ]
 
+    # Keys: transaction_id must be unique, every customer_id must exist in customers.customer_id
+    primary_key = "transaction_id"
+    foreign_keys = {
+        "customer_id": ("customers", "customer_id"),
+    }
+
     # 2) Expected data types (semantic)
     dtypes = {
         "transaction_id": str,
@@ -4,9 +4,15 @@ from pandas.api.types import (
     is_string_dtype,
     is_datetime64_any_dtype,
 )
+import numpy as np
 import pandas as pd
 from src.validation import schemas
 
+# Rows hashed per step by the key checks, keeps temporaries bounded on very large datasets
+KEY_CHUNK_ROWS = 1_000_000
+# Number of offending key values printed by the key checks
+KEY_SAMPLE_SIZE = 5
+
 def validate_customer_df(df: pd.DataFrame) -> bool:
     """Validate the customers DataFrame against the CustomerSchema."""
     is_valid = True
@@ -23,6 +29,10 @@ def validate_customer_df(df: pd.DataFrame) -> bool:
     if not check_column_constraints(df, schemas.CustomerSchema.constraints):
         is_valid = False
 
+    # Check primary key uniqueness
+    if not check_unique_key(df, schemas.CustomerSchema.primary_key):
+        is_valid = False
+
     return is_valid
 
 def validate_transaction_df(df: pd.DataFrame) -> bool:
@@ -41,6 +51,21 @@ def validate_transaction_df(df: pd.DataFrame) -> bool:
     if not check_column_constraints(df, schemas.TransactionSchema.constraints):
         is_valid = False
 
+    # Check primary key uniqueness
+    if not check_unique_key(df, schemas.TransactionSchema.primary_key):
+        is_valid = False
+
+    return is_valid
+
+def validate_referential_integrity(transactions_df: pd.DataFrame, customers_df: pd.DataFrame) -> bool:
+    """Validate the TransactionSchema foreign keys of the transactions DataFrame against the customers DataFrame."""
+    parent_dfs = {"customers": customers_df}
+    is_valid = True
+
+    for col, (parent_name, parent_col) in schemas.TransactionSchema.foreign_keys.items():
+        if not check_foreign_key(transactions_df, col, parent_dfs[parent_name], parent_col, parent_name):
+            is_valid = False
+
     return is_valid
 
 
@@ -155,4 +180,101 @@ def check_column_constraints(df: pd.DataFrame, constraints: dict) -> bool:
 
     return ok
 
+def hash_keys(series: pd.Series) -> np.ndarray:
+    """Map key values to compact uint64 hashes (8 bytes per key instead of a Python string object).
+    Distinct keys can in rare cases share a hash (about n**2 / 2**65 for n keys, ~3e-4 at 100M keys)."""
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+def check_unique_key(df: pd.DataFrame, col: str, chunk_rows: int = KEY_CHUNK_ROWS) -> bool:
+    """
+    Check that a key column has no null and no duplicated values.
+
+    Keys are hashed chunk by chunk into a single uint64 array which is then sorted,
+    so duplicates are adjacent. Memory stays at 8 bytes per row plus one chunk of
+    temporaries, regardless of how long the key strings are. Null keys are only
+    counted, they are left out of the duplicate scan. Reported samples are looked
+    up back in the original column.
+
+    Duplicates are detected on 64-bit hashes, so a hash collision between two
+    distinct keys can (very rarely) be reported as a duplicate.
+    """
+    if col not in df.columns:
+        # If the column doesn't exist, that is checked by check_required_columns
+        return True
+
+    n = len(df)
+    hashes = np.empty(n, dtype=np.uint64)
+    n_hashed = 0
+    for start in range(0, n, chunk_rows):
+        chunk = df[col].iloc[start:start + chunk_rows].dropna()
+        hashes[n_hashed:n_hashed + len(chunk)] = hash_keys(chunk)
+        n_hashed += len(chunk)
+    n_nulls = n - n_hashed
+    hashes = hashes[:n_hashed]
+
+    hashes.sort()
+    duplicated = hashes[1:] == hashes[:-1]
+    n_duplicates = int(duplicated.sum())  # rows repeating an earlier key
+    ok = True
+
+    if n_nulls:
+        print(f"[VALIDATION] Key column '{col}' has {n_nulls} null values")
+        ok = False
+
+    if n_duplicates:
+        sample_hashes = np.unique(hashes[1:][duplicated])[:KEY_SAMPLE_SIZE]
+        samples = set()
+        for start in range(0, n, chunk_rows):
+            chunk = df[col].iloc[start:start + chunk_rows].dropna()
+            samples.update(chunk[np.isin(hash_keys(chunk), sample_hashes)].tolist())
+        print(
+            f"[VALIDATION] Key column '{col}' has {n_duplicates} duplicated values "
+            f"(samples: {sorted(samples, key=str)[:KEY_SAMPLE_SIZE]})"
+        )
+        ok = False
+
+    return ok
+
+def check_foreign_key(df: pd.DataFrame, col: str, parent_df: pd.DataFrame, parent_col: str,
+                      parent_name: str, chunk_rows: int = KEY_CHUNK_ROWS) -> bool:
+    """
+    Check that every value of df[col] exists in parent_df[parent_col].
+
+    The parent keys are reduced to a sorted array of unique uint64 hashes and the
+    child column is tested against it chunk by chunk with a binary search
+    (np.searchsorted), so the child keys are never materialized all at once.
+    Null child keys are reported as missing.
 
+    Membership is tested on 64-bit hashes, so a missing key whose hash collides
+    with an existing parent key can (very rarely) go unreported.
+    """
+    if col not in df.columns or parent_col not in parent_df.columns:
+        print(f"[VALIDATION] Cannot check foreign key '{col}' -> {parent_name}.{parent_col}: missing column")
+        return False
+
+    parent_hashes = np.unique(hash_keys(parent_df[parent_col].dropna()))
+    n_missing = 0
+    samples = []
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df[col].iloc[start:start + chunk_rows]
+        chunk_hashes = hash_keys(chunk)
+        positions = np.searchsorted(parent_hashes, chunk_hashes)
+        positions = np.minimum(positions, max(len(parent_hashes) - 1, 0))
+        if len(parent_hashes):
+            found = parent_hashes[positions] == chunk_hashes
+        else:
+            found = np.zeros(len(chunk), dtype=bool)
+        found &= chunk.notna().to_numpy()
+
+        n_missing += int((~found).sum())
+        if len(samples) < KEY_SAMPLE_SIZE:
+            samples.extend(chunk[~found].tolist()[:KEY_SAMPLE_SIZE - len(samples)])
+
+    if n_missing:
+        print(
+            f"[VALIDATION] Column '{col}' has {n_missing} values not found in "
+            f"{parent_name}.{parent_col} (samples: {samples})"
+        )
+        return False
+    return True
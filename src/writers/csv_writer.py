@@ -0,0 +1,118 @@
+# Chunked CSV writer
+# Produces the same bytes as DataFrame.to_csv(path, index=False), but pre-formats the datetime and float
+# columns with vectorized string conversion and encodes and compresses row chunks in a thread pool.
+# CSV encoding runs in pandas' csv writer and holds the GIL, so the threads mostly help with
+# gzip/zstd compression (which releases the GIL) overlapping the encoding of the next chunks.
+
+import gzip
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_dtype
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+TICKS_PER_SECOND = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+def write_csv(df: pd.DataFrame, path: str, compression: str = "none", chunk_rows: int = 500_000,
+              threads: int = None, compression_level: int = None) -> None:
+    """Write df to path as CSV, encoding and compressing chunks of chunk_rows rows in a thread pool while keeping row order.
+    At most 2 * threads chunks are in flight, so encoded chunks never pile up in memory when writing is slow.
+
+    With compression 'gzip' or 'zstd' every chunk is compressed independently into its own gzip member /
+    zstd frame; concatenated members and frames are valid streams that any standard decompressor reads
+    back as a single file. With compression 'none' the output is byte-identical to df.to_csv(path, index=False).
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported CSV compression '{compression}', expected one of {COMPRESSIONS}")
+    compress = get_compressor(compression, compression_level)
+    threads = threads or min(8, os.cpu_count() or 1)
+
+    # Datetime columns use a single resolution for the whole column (same rule as pandas), so decide it upfront
+    datetime_units = {col: datetime_format_unit(df[col]) for col in df.columns if is_datetime64_dtype(df[col])}
+
+    def encode(start: int) -> bytes:
+        chunk = preformat_chunk(df.iloc[start:start + chunk_rows], datetime_units)
+        data = chunk.to_csv(index=False, header=False).encode("utf-8")
+        return compress(data)
+
+    with open(path, "wb") as file:
+        file.write(compress(df.head(0).to_csv(index=False).encode("utf-8")))
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            # Futures are written in submission order, so chunks are written in row order
+            in_flight = deque()
+            for start in range(0, len(df), chunk_rows):
+                if len(in_flight) >= 2 * threads:
+                    file.write(in_flight.popleft().result())
+                in_flight.append(pool.submit(encode, start))
+            while in_flight:
+                file.write(in_flight.popleft().result())
+
+
+def get_compressor(compression: str, level: int = None):
+    """Return a function that compresses one chunk of bytes into a self-contained gzip member or zstd frame."""
+    if compression == "none":
+        return lambda data: data
+    if compression == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the 'zstandard' package (pip install zstandard)") from e
+    level = 3 if level is None else level
+    # ZstdCompressor instances are not thread-safe, create one per call
+    return lambda data: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def preformat_chunk(chunk: pd.DataFrame, datetime_units: dict) -> pd.DataFrame:
+    """Replace the (timezone-naive) datetime and float64 columns of a chunk with their CSV string representation.
+    Other columns are left to to_csv."""
+    formatted = {}
+    for col in chunk.columns:
+        series = chunk[col]
+        if col in datetime_units:
+            formatted[col] = format_datetimes(series, datetime_units[col])
+        elif series.dtype == np.float64:
+            formatted[col] = format_floats(series)
+        else:
+            formatted[col] = series
+    return pd.DataFrame(formatted, index=chunk.index)
+
+
+def datetime_format_unit(series: pd.Series) -> str:
+    """Pick the resolution pandas uses when writing a datetime column: dates only if every value is at
+    midnight, otherwise seconds, milliseconds, microseconds or nanoseconds, whichever is the coarsest
+    resolution that represents every value exactly.
+    Works in the column's own unit, so e.g. datetime64[s] values outside the nanosecond range are kept."""
+    values = series.to_numpy()
+    ticks_per_second = TICKS_PER_SECOND[np.datetime_data(values.dtype)[0]]
+    ticks = values[~np.isnat(values)].view("int64")
+    for unit in ("ns", "us", "ms"):
+        if TICKS_PER_SECOND[unit] > ticks_per_second:
+            continue  # finer than the column's own unit
+        # unit is needed when some value is not a whole number of the next coarser unit
+        if (ticks % (ticks_per_second // TICKS_PER_SECOND[unit] * 1000)).any():
+            return unit
+    if (ticks % (86_400 * ticks_per_second)).any():
+        return "s"
+    return "D"
+
+
+def format_datetimes(series: pd.Series, unit: str) -> np.ndarray:
+    """Vectorized 'YYYY-MM-DD HH:MM:SS[.fff...]' formatting of a datetime column, NaT as empty string."""
+    values = series.to_numpy()
+    strings = np.char.replace(np.datetime_as_string(values, unit=unit), "T", " ")
+    strings[np.isnat(values)] = ""
+    return strings.astype(object)
+
+
+def format_floats(series: pd.Series) -> np.ndarray:
+    """Vectorized shortest round-trip formatting of a float column (same as repr(float)), NaN as empty string."""
+    values = series.to_numpy(dtype="float64")
+    strings = values.astype(str)
+    strings[np.isnan(values)] = ""
+    return strings.astype(object)